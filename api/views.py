@@ -333,8 +333,7 @@ class GenerarHorarioView(APIView):
             raise
 
     def _calcular_diffs(self, nuevos_horarios: List[Dict]) -> Dict[str, Any]:
-        actuales = list(Horario.objects.all().values('curso_id','profesor_id','materia_id','dia','bloque'))
-        actuales_set = set((h['curso_id'], h['profesor_id'], h['materia_id'], h['dia'], h['bloque']) for h in actuales)
+        actuales_set = set(Horario.objects.asignaciones().iterator(chunk_size=5000))
         nuevos_set = set((h['curso_id'], h['profesor_id'], h['materia_id'], h['dia'], h['bloque']) for h in nuevos_horarios)
         added = nuevos_set - actuales_set
         removed = actuales_set - nuevos_set
@@ -731,6 +730,8 @@ class SolverView(APIView):
                 self._limpiar_base_de_datos()
                 mapeo_materias = {}
                 mapeo_profesores = {}
+                materias_profesor = []
+                materias_grado = set()
                 conf = data.get('configuracion', {})
                 dias = conf.get('dias_clase', 'lunes,martes,miércoles,jueves,viernes').lower()
                 ConfiguracionColegio.objects.create(
@@ -773,10 +774,8 @@ class SolverView(APIView):
                     if 'materias_capaces' in p_data:
                         for mat_nombre in p_data['materias_capaces']:
                             if mat_nombre in mapeo_materias:
-                                MateriaProfesor.objects.create(
-                                    profesor=profesor,
-                                    materia=mapeo_materias[mat_nombre]
-                                )
+                                materias_profesor.append((profesor.id, mapeo_materias[mat_nombre].id))
+                MateriaProfesor.crear_en_lote(materias_profesor)
                 from horarios.models import Grado, MateriaGrado, CursoMateriaRequerida, ConfiguracionCurso
                 for c_data in data['cursos']:
                     grado_nombre = c_data['grado']
@@ -794,12 +793,13 @@ class SolverView(APIView):
                     for mat_nombre, bloques in plan.items():
                         if mat_nombre in mapeo_materias:
                             materia = mapeo_materias[mat_nombre]
-                            MateriaGrado.objects.get_or_create(grado=grado, materia=materia)
+                            materias_grado.add((grado.id, materia.id))
                             CursoMateriaRequerida.objects.create(
                                 curso=curso,
                                 materia=materia,
                                 bloques_requeridos=bloques
                             )
+                MateriaGrado.crear_en_lote(materias_grado)
                 # Materializar datos antes de invocar al generador
                 from horarios.management.commands.sync_aux_tables import Command as SyncCommand
                 sync_cmd = SyncCommand()
@@ -19,6 +19,7 @@ from horarios.models import (
 )
 from horarios.domain.validators.validador_reglas_duras import ValidadorReglasDuras
 from horarios.domain.validators.validador_precondiciones import ValidadorPrecondiciones
+from horarios.domain.services.disponibilidad_bitmap import BitmapDisponibilidad
 
 logger = logging.getLogger(__name__)
 
@@ -150,7 +151,7 @@ class GeneradorDemandFirst:
         """Obtiene configuración del colegio"""
         config = ConfiguracionColegio.objects.first()
         if config:
-            dias_clase = [d.strip() for d in config.dias_clase.split(',')]
+            dias_clase = config.lista_dias_clase
             return {
                 'bloques_por_dia': config.bloques_por_dia,
                 'dias_clase': dias_clase,
@@ -350,12 +351,12 @@ class GeneradorDemandFirst:
             logger.warning(f"No hay materias de relleno disponibles para {curso.nombre}")
             return []
         
-        # Crear lista de slots disponibles
+        # Crear lista de slots disponibles (solo se excluyen los ya ocupados por el curso)
+        ocupados_curso = {(s.dia, s.bloque) for s in slots_existentes}
         slots_disponibles = []
         for dia in self.config_colegio['dias_clase']:
             for bloque in self.config_colegio['bloques_clase']:
-                # Solo excluir slots ya ocupados por el curso
-                if not any(s.dia == dia and s.bloque == bloque for s in slots_existentes):
+                if (dia, bloque) not in ocupados_curso:
                     slots_disponibles.append((dia, bloque))
         
         self.random.shuffle(slots_disponibles)
@@ -424,19 +425,14 @@ class GeneradorDemandFirst:
         if not hasattr(self, 'disponibilidad_cache'):
             self._cargar_disponibilidad()
         
-        return (dia, bloque) in self.disponibilidad_cache.get(profesor.id, set())
+        return self.disponibilidad_cache.disponible(profesor.id, dia, bloque)
 
     def _cargar_disponibilidad(self):
-        """Carga disponibilidad de todos los profesores en memoria para acceso O(1)"""
-        self.disponibilidad_cache = defaultdict(set)
+        """Carga disponibilidad de todos los profesores en un bitmap para acceso O(1)"""
         # Optimización: traer solo los campos necesarios
-        disponibilidades = DisponibilidadProfesor.objects.values('profesor_id', 'dia', 'bloque_inicio', 'bloque_fin')
-        
-        for disp in disponibilidades:
-            prof_id = disp['profesor_id']
-            dia = disp['dia']
-            for bloque in range(disp['bloque_inicio'], disp['bloque_fin'] + 1):
-                self.disponibilidad_cache[prof_id].add((dia, bloque))
+        self.disponibilidad_cache = BitmapDisponibilidad(
+            DisponibilidadProfesor.objects.values_list('profesor_id', 'dia', 'bloque_inicio', 'bloque_fin')
+        )
     
     def _obtener_slots_objetivo(self, curso: Curso) -> int:
         """Obtiene número objetivo de slots para un curso"""
@@ -460,6 +456,13 @@ class GeneradorDemandFirst:
     
     def _obtener_profesores_aptos_relleno(self, materia: Materia) -> List[Profesor]:
         """Obtiene profesores aptos para una materia de relleno"""
+        # Se consulta una vez por materia: _completar_con_relleno lo pide en cada slot.
+        # La lista cacheada no se muta (_buscar_profesor_disponible baraja una copia)
+        if not hasattr(self, '_cache_profes_relleno'):
+            self._cache_profes_relleno = {}
+        if materia.id in self._cache_profes_relleno:
+            return self._cache_profes_relleno[materia.id]
+        
         # Profesores específicamente asignados
         profesores_especificos = list(Profesor.objects.filter(materiaprofesor__materia=materia))
         
@@ -476,6 +479,7 @@ class GeneradorDemandFirst:
                 ids_unicos.add(profesor.id)
                 profesores_finales.append(profesor)
         
+        self._cache_profes_relleno[materia.id] = profesores_finales
         return profesores_finales
     
     def _mejora_iterativa(self, estado_inicial: EstadoGeneracion, kwargs: Dict) -> EstadoGeneracion:
@@ -488,9 +492,13 @@ class GeneradorDemandFirst:
         max_sin_mejora = kwargs.get('paciencia', 50)
         max_iteraciones = kwargs.get('max_iteraciones', 1000)
         
+        # Los swaps no mueven slots de posición ni cambian los cursos completos:
+        # los índices se construyen una vez en lugar de recorrer todos los slots por iteración
+        cursos_completos, indices_por_curso = self._indexar_slots(estado_inicial)
+        
         for iteracion in range(max_iteraciones):
             # Aplicar operadores de mejora
-            nuevo_estado = self._aplicar_operadores_mejora(estado_actual)
+            nuevo_estado = self._aplicar_operadores_mejora(estado_actual, cursos_completos, indices_por_curso)
             
             if nuevo_estado.calidad_actual > mejor_calidad:
                 estado_actual = nuevo_estado
@@ -508,7 +516,16 @@ class GeneradorDemandFirst:
         logger.info(f"Mejora completada: calidad final {estado_actual.calidad_actual:.3f}")
         return estado_actual
     
-    def _aplicar_operadores_mejora(self, estado: EstadoGeneracion) -> EstadoGeneracion:
+    def _indexar_slots(self, estado: EstadoGeneracion) -> Tuple[List[int], Dict[int, List[int]]]:
+        """Lista de cursos completos y posiciones de los slots de cada curso en estado.slots"""
+        indices_por_curso = defaultdict(list)
+        for i, slot in enumerate(estado.slots):
+            indices_por_curso[slot.curso_id].append(i)
+        return list(estado.cursos_completos), indices_por_curso
+    
+    def _aplicar_operadores_mejora(self, estado: EstadoGeneracion,
+                                   cursos_completos: Optional[List[int]] = None,
+                                   indices_por_curso: Optional[Dict[int, List[int]]] = None) -> EstadoGeneracion:
         """
         Aplica operador de mutación: Swap Intra-Curso.
         
@@ -520,6 +537,9 @@ class GeneradorDemandFirst:
         Validaciones:
         - Verifica que el profesor del bloque A pueda dar clase en el horario B y viceversa.
         - Verifica que los profesores no tengan choque con otros cursos en los nuevos horarios.
+        
+        cursos_completos e indices_por_curso (ver _indexar_slots) se pueden reutilizar
+        entre llamadas sobre estados derivados por swaps; si faltan se calculan aquí.
         """
         import copy
         
@@ -530,8 +550,11 @@ class GeneradorDemandFirst:
         if not estado.cursos_completos:
             return estado
             
-        curso_id = self.random.choice(list(estado.cursos_completos))
-        indices = [i for i, s in enumerate(nuevos_slots) if s.curso_id == curso_id]
+        if cursos_completos is None or indices_por_curso is None:
+            cursos_completos, indices_por_curso = self._indexar_slots(estado)
+        
+        curso_id = self.random.choice(cursos_completos)
+        indices = indices_por_curso.get(curso_id, [])
         
         if len(indices) < 2:
             return estado
@@ -559,8 +582,8 @@ class GeneradorDemandFirst:
             es_factible = True
         else:
             # Disponibilidad horaria (usando cache)
-            p1_disp = (dia2, bloque2) in self.disponibilidad_cache.get(prof1, set())
-            p2_disp = (dia1, bloque1) in self.disponibilidad_cache.get(prof2, set())
+            p1_disp = self.disponibilidad_cache.disponible(prof1, dia2, bloque2)
+            p2_disp = self.disponibilidad_cache.disponible(prof2, dia1, bloque1)
             
             if p1_disp and p2_disp:
                 # Chequear choques con otros cursos
@@ -0,0 +1,40 @@
+"""
+Población de CursoMateriaRequerida a partir del plan de estudios de cada grado.
+Compartido por seed_data (datos en memoria) y sync_aux_tables (datos de la BD).
+"""
+
+from typing import Dict, Iterable, List
+
+from django.db import transaction
+
+from horarios.models import Curso, Materia, CursoMateriaRequerida
+
+
+def poblar_curso_materia_requerida(cursos: Iterable[Curso],
+                                   materias_por_grado: Dict[int, List[Materia]]) -> int:
+    """
+    Reconstruye CursoMateriaRequerida: cada curso recibe las materias del plan de su
+    grado con sus bloques_por_semana por defecto.
+
+    Args:
+        cursos: Cursos con `id` y `grado_id` cargados.
+        materias_por_grado: grado_id -> materias del plan de estudios de ese grado.
+
+    Returns:
+        Número de requerimientos creados.
+    """
+    filas = [
+        CursoMateriaRequerida(
+            curso_id=curso.id,
+            materia_id=materia.id,
+            bloques_requeridos=materia.bloques_por_semana
+        )
+        for curso in cursos
+        for materia in materias_por_grado.get(curso.grado_id, ())
+    ]
+
+    with transaction.atomic():
+        CursoMateriaRequerida.objects.all().delete()
+        CursoMateriaRequerida.objects.bulk_create(filas, batch_size=1000, ignore_conflicts=True)
+
+    return len(filas)
@@ -0,0 +1,48 @@
+"""
+Disponibilidad docente empaquetada en un entero por profesor.
+
+Cada bit representa un par (día, bloque): consultar disponibilidad es un
+desplazamiento y una máscara, sin tuplas ni conjuntos por profesor.
+"""
+
+from typing import Dict, Iterable, Tuple
+
+# Ancho mínimo reservado por día (ConfiguracionColegio admite hasta 12 bloques)
+MAX_BLOQUES = 12
+
+
+class BitmapDisponibilidad:
+    """Mapa profesor_id -> bits de los (día, bloque) en que puede dictar clase."""
+
+    __slots__ = ('_bits', '_ancho', '_dia_idx')
+
+    def __init__(self, filas: Iterable[Tuple[int, str, int, int]]):
+        """
+        Args:
+            filas: Tuplas (profesor_id, dia, bloque_inicio, bloque_fin), como las de
+                DisponibilidadProfesor.objects.values_list(...).
+        """
+        filas = list(filas)
+        # Los días se indexan tal como vienen en los datos (incluye sábado, domingo
+        # o nombres sin tilde): un día sin filas simplemente no tiene disponibilidad
+        self._dia_idx: Dict[str, int] = {}
+        for _, dia, _, _ in filas:
+            self._dia_idx.setdefault(dia, len(self._dia_idx))
+        # El bit de un bloque es su número; el ancho cubre el mayor bloque_fin registrado
+        self._ancho = max([MAX_BLOQUES] + [fin for _, _, _, fin in filas]) + 1
+        bits: Dict[int, int] = {}
+        for profesor_id, dia, inicio, fin in filas:
+            inicio = max(inicio, 0)
+            if inicio > fin:
+                continue
+            desplazamiento = self._dia_idx[dia] * self._ancho
+            rango = ((1 << (fin - inicio + 1)) - 1) << (desplazamiento + inicio)
+            bits[profesor_id] = bits.get(profesor_id, 0) | rango
+        self._bits = bits
+
+    def disponible(self, profesor_id: int, dia: str, bloque: int) -> bool:
+        """Indica si el profesor puede dictar en ese día y bloque."""
+        idx = self._dia_idx.get(dia)
+        if idx is None or not 0 <= bloque < self._ancho:
+            return False
+        return (self._bits.get(profesor_id, 0) >> (idx * self._ancho + bloque)) & 1 == 1
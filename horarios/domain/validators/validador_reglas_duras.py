@@ -361,7 +361,7 @@ class ValidadorReglasDuras:
         
         config_colegio = ConfiguracionColegio.objects.first()
         if config_colegio:
-            dias_semana = len(config_colegio.dias_clase.split(','))
+            dias_semana = len(config_colegio.lista_dias_clase)
             slots_totales = config_colegio.bloques_por_dia * dias_semana
         else:
             slots_totales = 30  # Default
@@ -505,7 +505,7 @@ class ValidadorReglasDuras:
         # Contar cursos completos
         config_colegio = ConfiguracionColegio.objects.first()
         if config_colegio:
-            dias_semana = len(config_colegio.dias_clase.split(','))
+            dias_semana = len(config_colegio.lista_dias_clase)
             slots_esperados = config_colegio.bloques_por_dia * dias_semana
         else:
             slots_esperados = 30
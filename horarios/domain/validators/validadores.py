@@ -15,6 +15,7 @@ from horarios.models import (
     Horario, Curso, Materia, Profesor, DisponibilidadProfesor,
     BloqueHorario, MateriaGrado, MateriaProfesor
 )
+from horarios.domain.services.disponibilidad_bitmap import BitmapDisponibilidad
 
 logger = logging.getLogger(__name__)
 
@@ -143,22 +144,18 @@ class ValidadorHorarios:
     
     def _validar_disponibilidad_profesores(self, horarios: List[Dict]):
         """Valida que los profesores solo estén asignados en bloques disponibles."""
-        # Cargar disponibilidad de profesores de manera más eficiente
-        disponibilidad = {}
-        profesores_sin_disponibilidad = set()
-        
         # Cargar todos los profesores
         todos_profesores = set(Profesor.objects.values_list('id', flat=True))
         
-        # Cargar disponibilidad
-        for disp in DisponibilidadProfesor.objects.select_related('profesor').all():
-            if disp.profesor_id not in disponibilidad:
-                disponibilidad[disp.profesor_id] = set()
-            for bloque in range(disp.bloque_inicio, disp.bloque_fin + 1):
-                disponibilidad[disp.profesor_id].add((disp.dia, bloque))
+        # Cargar disponibilidad (una consulta, sin instanciar modelos)
+        filas_disponibilidad = list(DisponibilidadProfesor.objects.values_list(
+            'profesor_id', 'dia', 'bloque_inicio', 'bloque_fin'
+        ))
+        disponibilidad = BitmapDisponibilidad(filas_disponibilidad)
+        con_disponibilidad = {fila[0] for fila in filas_disponibilidad}
         
         # Identificar profesores sin disponibilidad
-        profesores_sin_disponibilidad = todos_profesores - set(disponibilidad.keys())
+        profesores_sin_disponibilidad = todos_profesores - con_disponibilidad
         
         asignaciones_invalidas = []
         
@@ -167,8 +164,8 @@ class ValidadorHorarios:
             dia = horario['dia']
             bloque = horario['bloque']
             
-            if profesor_id in disponibilidad:
-                if (dia, bloque) not in disponibilidad[profesor_id]:
+            if profesor_id in con_disponibilidad:
+                if not disponibilidad.disponible(profesor_id, dia, bloque):
                     asignaciones_invalidas.append({
                         'profesor_id': profesor_id,
                         'profesor_nombre': horario.get('profesor_nombre', ''),
@@ -224,9 +221,7 @@ class ValidadorHorarios:
     def _validar_bloques_por_semana(self, horarios: List[Dict]):
         """Valida que cada materia cumpla exactamente con bloques_por_semana."""
         # Cargar bloques requeridos por materia
-        bloques_requeridos = {}
-        for materia in Materia.objects.all():
-            bloques_requeridos[materia.id] = materia.bloques_por_semana
+        bloques_requeridos = dict(Materia.objects.values_list('id', 'bloques_por_semana'))
         
         # Contar bloques asignados por curso y materia
         bloques_asignados = defaultdict(int)
@@ -285,10 +280,9 @@ class ValidadorHorarios:
     def _validar_aulas_fijas(self, horarios: List[Dict]):
         """Valida que cada curso use su aula fija asignada."""
         # Cargar aulas fijas de cursos
-        aulas_fijas = {}
-        for curso in Curso.objects.all():
-            if curso.aula_fija:
-                aulas_fijas[curso.id] = curso.aula_fija.id
+        aulas_fijas = dict(
+            Curso.objects.filter(aula_fija__isnull=False).values_list('id', 'aula_fija_id')
+        )
         
         aulas_incorrectas = []
         for horario in horarios:
@@ -45,16 +45,15 @@ def exportar_horario_csv():
         'Tipo Aula'
     ])
     
+    # Horas de cada bloque, cargadas una vez (si un número tiene varios tipos, manda 'clase')
+    horas_bloque = {}
+    for numero, inicio, fin, tipo in BloqueHorario.objects.values_list('numero', 'hora_inicio', 'hora_fin', 'tipo'):
+        if numero not in horas_bloque or tipo == 'clase':
+            horas_bloque[numero] = (inicio.strftime('%H:%M'), fin.strftime('%H:%M'))
+    
     # Escribir datos
     for horario in horarios:
-        # Obtener información del bloque
-        try:
-            bloque_obj = BloqueHorario.objects.get(numero=horario.bloque)
-            hora_inicio = bloque_obj.hora_inicio.strftime('%H:%M')
-            hora_fin = bloque_obj.hora_fin.strftime('%H:%M')
-        except BloqueHorario.DoesNotExist:
-            hora_inicio = "N/A"
-            hora_fin = "N/A"
+        hora_inicio, hora_fin = horas_bloque.get(horario.bloque, ("N/A", "N/A"))
         
         writer.writerow([
             horario.curso.grado.nombre,
@@ -466,7 +466,7 @@ class SistemaReportes:
         """Obtiene configuración del colegio"""
         config = ConfiguracionColegio.objects.first()
         if config:
-            dias_clase = [d.strip() for d in config.dias_clase.split(',')]
+            dias_clase = config.lista_dias_clase
             return {
                 'bloques_por_dia': config.bloques_por_dia,
                 'dias_clase': dias_clase,
@@ -1,4 +1,5 @@
 from django.core.management.base import BaseCommand
+from django.db.models import Count, F, Sum
 from typing import Dict, List, Tuple
 import csv
 from collections import defaultdict
@@ -107,32 +108,24 @@ class Command(BaseCommand):
         self.stdout.write("\n👨‍🏫 ANÁLISIS DE DISPONIBILIDAD DE PROFESORES:")
         
         try:
-            profesores = Profesor.objects.all()
-            self.stdout.write(f"   ✅ {profesores.count()} profesores encontrados")
+            total_profesores = Profesor.objects.count()
+            self.stdout.write(f"   ✅ {total_profesores} profesores encontrados")
             
-            # Analizar disponibilidad por profesor
-            sin_disponibilidad = 0
-            disponibilidad_insuficiente = 0
+            # Bloques disponibles por profesor, sumados en la BD (un rango por profesor y día)
+            slots_por_profe = dict(
+                DisponibilidadProfesor.objects.values('profesor_id')
+                .annotate(slots=Sum(F('bloque_fin') - F('bloque_inicio') + 1))
+                .values_list('profesor_id', 'slots')
+            )
+            sin_disponibilidad = total_profesores - len(slots_por_profe)
             
-            for profesor in profesores:
-                disponibilidades = DisponibilidadProfesor.objects.filter(profesor=profesor)
-                if not disponibilidades.exists():
-                    sin_disponibilidad += 1
-                    continue
-                
-                # Verificar si la disponibilidad cubre todos los bloques
-                bloques_disponibles = set()
-                for disp in disponibilidades:
-                    for bloque in range(disp.bloque_inicio, disp.bloque_fin + 1):
-                        bloques_disponibles.add((disp.dia, bloque))
-                
-                # Verificar si hay suficientes bloques disponibles
-                dias_config = ['lunes', 'martes', 'miércoles', 'jueves', 'viernes']
-                bloques_config = list(BloqueHorario.objects.filter(tipo='clase').values_list('numero', flat=True))
-                
-                slots_esperados = len(dias_config) * len(bloques_config)
-                if len(bloques_disponibles) < slots_esperados * 0.8:  # 80% de cobertura mínima
-                    disponibilidad_insuficiente += 1
+            # Verificar si hay suficientes bloques disponibles
+            dias_config = ['lunes', 'martes', 'miércoles', 'jueves', 'viernes']
+            slots_esperados = len(dias_config) * BloqueHorario.objects.filter(tipo='clase').count()
+            disponibilidad_insuficiente = sum(
+                1 for slots in slots_por_profe.values()
+                if slots < slots_esperados * 0.8  # 80% de cobertura mínima
+            )
             
             self.stdout.write(f"   - Sin disponibilidad: {sin_disponibilidad}")
             self.stdout.write(f"   - Disponibilidad insuficiente: {disponibilidad_insuficiente}")
@@ -185,19 +178,18 @@ class Command(BaseCommand):
         try:
             # Calcular capacidad total del sistema
             dias_config = ['lunes', 'martes', 'miércoles', 'jueves', 'viernes']
-            bloques_clase = list(BloqueHorario.objects.filter(tipo='clase').values_list('numero', flat=True))
-            cursos = Curso.objects.all()
+            n_bloques_clase = BloqueHorario.objects.filter(tipo='clase').count()
+            cursos_por_grado = defaultdict(int)
+            for grado_id in Curso.objects.values_list('grado_id', flat=True):
+                cursos_por_grado[grado_id] += 1
             
-            capacidad_total = len(dias_config) * len(bloques_clase) * cursos.count()
+            capacidad_total = len(dias_config) * n_bloques_clase * sum(cursos_por_grado.values())
             self.stdout.write(f"   - Capacidad total del sistema: {capacidad_total} slots")
             
-            # Calcular demanda total
+            # Calcular demanda total: cada materia del grado cuenta una vez por curso del grado
             demanda_total = 0
-            for curso in cursos:
-                materias_curso = MateriaGrado.objects.filter(grado=curso.grado)
-                for materia_grado in materias_curso:
-                    if materia_grado.materia:
-                        demanda_total += materia_grado.materia.bloques_por_semana
+            for grado_id, bloques in MateriaGrado.objects.values_list('grado_id', 'materia__bloques_por_semana'):
+                demanda_total += cursos_por_grado[grado_id] * bloques
             
             self.stdout.write(f"   - Demanda total del sistema: {demanda_total} bloques")
             
@@ -221,35 +213,27 @@ class Command(BaseCommand):
         self.stdout.write("\n📊 ANÁLISIS DE FACTIBILIDAD POR MATERIA:")
         
         try:
-            from collections import defaultdict
-            from horarios.models import MateriaGrado, MateriaProfesor, DisponibilidadProfesor
-            
-            # 1. Calcular DEMANDA por materia
-            demanda = defaultdict(int)
-            cursos = Curso.objects.all()
-            
-            for curso in cursos:
-                materias_grado = MateriaGrado.objects.filter(grado=curso.grado).select_related('materia')
-                for mg in materias_grado:
-                    demanda[mg.materia.id] += mg.materia.bloques_por_semana
-            
-            # 2. Calcular CAPACIDAD por materia
-            capacidad = defaultdict(int)
-            profes_por_materia = defaultdict(set)
-            for mp in MateriaProfesor.objects.all():
-                profes_por_materia[mp.materia.id].add(mp.profesor.id)
-            
-            slots_por_profe = defaultdict(int)
-            for disp in DisponibilidadProfesor.objects.all():
-                slots = disp.bloque_fin - disp.bloque_inicio + 1
-                slots_por_profe[disp.profesor.id] += slots
+            # 1. Calcular DEMANDA por materia (cursos del grado × bloques por semana)
+            demanda = {
+                fila['materia_id']: fila['demanda']
+                for fila in MateriaGrado.objects.values('materia_id').annotate(
+                    demanda=Count('grado__curso') * F('materia__bloques_por_semana')
+                )
+            }
             
-            for materia_id, profe_ids in profes_por_materia.items():
-                for pid in profe_ids:
-                    capacidad[materia_id] += slots_por_profe[pid]
+            # 2. Calcular CAPACIDAD por materia (bloques disponibles de sus profesores)
+            capacidad = {
+                fila['materia_id']: fila['capacidad'] or 0
+                for fila in MateriaProfesor.objects.values('materia_id').annotate(
+                    capacidad=Sum(
+                        F('profesor__disponibilidadprofesor__bloque_fin')
+                        - F('profesor__disponibilidadprofesor__bloque_inicio') + 1
+                    )
+                )
+            }
             
-            # 3. Reportar
-            materias = Materia.objects.all()
+            # 3. Reportar (solo id y nombre: sin instanciar modelos)
+            materias = Materia.objects.values_list('id', 'nombre', named=True).iterator(chunk_size=500)
             problemas = 0
             
             for m in materias:
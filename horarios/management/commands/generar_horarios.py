@@ -6,17 +6,66 @@ Implementa reglas duras, validaciones previas y lógica demand-first.
 
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
+from contextlib import contextmanager
+from datetime import date, datetime, time as hora
+from enum import Enum
 import json
+import math
 import time
 import logging
 
 from horarios.models import Horario
 from horarios.domain.validators.validador_precondiciones import ValidadorPrecondiciones
-from horarios.application.services.generador_demand_first import GeneradorDemandFirst
-from horarios.infrastructure.adapters.sistema_reportes import SistemaReportes
+
+# Importación condicional de msgspec (codificador JSON implementado en C)
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+@contextmanager
+def _medir_paso(nombre: str, tiempos: dict):
+    """Registra en `tiempos` la duración del paso, también cuando falla"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        tiempos[nombre] = time.perf_counter() - inicio
+
+def _serializar_nodo(obj):
+    """
+    Convierte un único objeto no serializable; el encoder recorre el resultado.
+    Reproduce la salida nativa de msgspec para que el reporte no dependa del encoder.
+    """
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, datetime):
+        texto = obj.isoformat()
+        # msgspec escribe UTC con sufijo 'Z'
+        return texto[:-6] + 'Z' if texto.endswith('+00:00') else texto
+    if isinstance(obj, (date, hora)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if hasattr(obj, '__dict__'):
+        return obj.__dict__
+    return str(obj)
+
+def _sin_no_finitos(obj):
+    """Copia del reporte con NaN/Infinity como None (msgspec los escribe como null)"""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _sin_no_finitos(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_sin_no_finitos(v) for v in obj]
+    if isinstance(obj, (str, int)) or obj is None:
+        return obj
+    return _sin_no_finitos(_serializar_nodo(obj))
+
 class Command(BaseCommand):
     help = 'Genera horarios usando el sistema principal (reglas duras y lógica demand-first)'
 
@@ -92,10 +141,13 @@ class Command(BaseCommand):
             logging.basicConfig(level=logging.INFO)
         
         self.stdout.write(self.style.SUCCESS('🚀 Iniciando generación de horarios'))
+        self._horarios_limpiados = False
+        tiempos_pasos = {}
         
         try:
             # 1. Validar precondiciones
-            resultado_validacion = self._validar_precondiciones(options)
+            with _medir_paso('validar_precondiciones', tiempos_pasos):
+                resultado_validacion = self._validar_precondiciones(options)
             if not resultado_validacion and not options['reporte_solo']:
                 return
             
@@ -113,11 +165,13 @@ class Command(BaseCommand):
                 self._limpiar_horarios_existentes()
             
             # 5. Generar horarios
-            resultado_generacion = self._generar_horarios(options)
+            with _medir_paso('generar_horarios', tiempos_pasos):
+                resultado_generacion = self._generar_horarios(options)
             
             # 6. Guardar resultados
             if resultado_generacion['exito']:
-                self._guardar_horarios(resultado_generacion['horarios'])
+                with _medir_paso('guardar_horarios', tiempos_pasos):
+                    self._guardar_horarios(resultado_generacion['horarios'])
                 self._mostrar_resultado_exitoso(resultado_generacion)
             else:
                 self._mostrar_resultado_fallido(resultado_generacion)
@@ -126,6 +180,9 @@ class Command(BaseCommand):
             self._generar_reporte_final(options, resultado_generacion)
             
         except Exception as e:
+            # El último paso medido es el que falló
+            paso_fallido = next(reversed(tiempos_pasos), None)
+            logger.error("Fallo en el paso '%s'. Tiempos por paso (s): %s", paso_fallido, tiempos_pasos)
             logger.exception("Error durante la generación")
             raise CommandError(f'Error durante la generación: {str(e)}')
 
@@ -160,6 +217,8 @@ class Command(BaseCommand):
 
     def _generar_reporte_solo(self, options):
         """Genera solo reporte del estado actual"""
+        from horarios.infrastructure.adapters.sistema_reportes import SistemaReportes
+        
         self.stdout.write('📊 Generando reporte del estado actual...')
         
         sistema_reportes = SistemaReportes()
@@ -189,13 +248,16 @@ class Command(BaseCommand):
         """Limpia horarios existentes"""
         self.stdout.write('🧹 Limpiando horarios existentes...')
         
-        count = Horario.objects.count()
-        Horario.objects.all().delete()
+        count, _ = Horario.objects.all().delete()
+        self._horarios_limpiados = True
         
         self.stdout.write(self.style.WARNING(f'   Eliminados {count} horarios'))
 
     def _generar_horarios(self, options) -> dict:
         """Genera horarios usando el sistema demand-first"""
+        # Importación diferida: --validar-solo y --reporte-solo no cargan el generador
+        from horarios.application.services.generador_demand_first import GeneradorDemandFirst
+        
         self.stdout.write('⚙️ Generando horarios con lógica demand-first...')
         
         generador = GeneradorDemandFirst()
@@ -222,38 +284,26 @@ class Command(BaseCommand):
         self.stdout.write('💾 Guardando horarios en base de datos...')
         
         with transaction.atomic():
-            # Limpiar horarios existentes
-            Horario.objects.all().delete()
+            # Limpiar horarios existentes (una sola vez por corrida: si --limpiar-antes
+            # ya vació la tabla no se repite el DELETE completo)
+            if not self._horarios_limpiados:
+                Horario.objects.all().delete()
             
-            # Crear nuevos horarios
-            horarios_objetos = []
-            
-            for h in horarios_lista:
-                try:
-                    from horarios.models import Curso, Materia, Profesor, Aula
-                    
-                    curso = Curso.objects.get(id=h['curso_id'])
-                    materia = Materia.objects.get(id=h['materia_id'])
-                    profesor = Profesor.objects.get(id=h['profesor_id'])
-                    
-                    aula = None
-                    if h.get('aula_id'):
-                        aula = Aula.objects.get(id=h['aula_id'])
-                    
-                    horario = Horario(
-                        curso=curso,
-                        materia=materia,
-                        profesor=profesor,
-                        dia=h['dia'],
-                        bloque=h['bloque'],
-                        aula=aula
-                    )
-                    
-                    horarios_objetos.append(horario)
-                    
-                except Exception as e:
-                    logger.warning(f"Error creando horario: {e}")
-                    continue
+            # Insertar en el orden del índice único (curso, dia, bloque) reduce
+            # divisiones de páginas del B-tree durante el bulk_create.
+            # Asignación directa de claves foráneas: sin consultas por fila; una fila
+            # mal formada (KeyError) aborta la transacción en vez de guardar un horario parcial
+            horarios_objetos = [
+                Horario(
+                    curso_id=h['curso_id'],
+                    materia_id=h['materia_id'],
+                    profesor_id=h['profesor_id'],
+                    dia=h['dia'],
+                    bloque=h['bloque'],
+                    aula_id=h.get('aula_id')
+                )
+                for h in sorted(horarios_lista, key=lambda h: (h['curso_id'], h['dia'], h['bloque']))
+            ]
             
             # Guardar en lote
             Horario.objects.bulk_create(horarios_objetos)
@@ -304,6 +354,8 @@ class Command(BaseCommand):
         if not options['guardar_reporte']:
             return
         
+        from horarios.infrastructure.adapters.sistema_reportes import SistemaReportes
+        
         self.stdout.write('📋 Generando reporte final...')
         
         sistema_reportes = SistemaReportes()
@@ -324,26 +376,27 @@ class Command(BaseCommand):
     def _guardar_reporte_json(self, reporte: dict, archivo: str):
         """Guarda reporte en archivo JSON"""
         try:
-            # Convertir objetos no serializables
-            reporte_serializable = self._hacer_serializable(reporte)
-            
-            with open(archivo, 'w', encoding='utf-8') as f:
-                json.dump(reporte_serializable, f, indent=2, ensure_ascii=False)
+            if MSGSPEC_AVAILABLE:
+                # msgspec codifica dataclasses, dicts y listas en C sin recorrer
+                # el reporte en Python; solo los objetos desconocidos pasan por el hook
+                contenido = msgspec.json.encode(reporte, enc_hook=_serializar_nodo)
+                with open(archivo, 'wb') as f:
+                    f.write(msgspec.json.format(contenido, indent=2))
+            else:
+                # json.dump escribe por fragmentos (iterencode) y solo invoca el hook
+                # en los nodos no serializables: no se construye una copia del reporte
+                with open(archivo, 'w', encoding='utf-8') as f:
+                    try:
+                        json.dump(reporte, f, indent=2, ensure_ascii=False, allow_nan=False,
+                                  default=_serializar_nodo)
+                    except ValueError:
+                        # NaN/Infinity no son JSON válido: se reescribe el reporte con null
+                        f.seek(0)
+                        f.truncate()
+                        json.dump(_sin_no_finitos(reporte), f, indent=2, ensure_ascii=False,
+                                  default=_serializar_nodo)
             
             self.stdout.write(self.style.SUCCESS(f'   📄 Reporte guardado en: {archivo}'))
             
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'   ❌ Error guardando reporte: {e}'))
-
-    def _hacer_serializable(self, obj):
-        """Convierte objeto a formato serializable JSON"""
-        if hasattr(obj, '__dict__'):
-            return {k: self._hacer_serializable(v) for k, v in obj.__dict__.items()}
-        elif isinstance(obj, dict):
-            return {k: self._hacer_serializable(v) for k, v in obj.items()}
-        elif isinstance(obj, (list, tuple)):
-            return [self._hacer_serializable(item) for item in obj]
-        elif isinstance(obj, (str, int, float, bool)) or obj is None:
-            return obj
-        else:
-            return str(obj)
@@ -1,9 +1,13 @@
+import sys
 import time
 from django.core.management.base import BaseCommand
 from django.db import connections
 from django.db.utils import OperationalError
 from django_redis import get_redis_connection
 from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+REDIS_TIMEOUT_S = 2
 
 class Command(BaseCommand):
     help = 'Verifica la salud de las conexiones a Base de Datos y Redis'
@@ -19,18 +23,22 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS('✓ Base de Datos (PostgreSQL/SQLite): Conectada'))
         except OperationalError:
             self.stdout.write(self.style.ERROR('✗ Base de Datos: Fallo de conexión'))
-            exit(1)
+            sys.exit(1)
         end_time = time.time()
         self.stdout.write(self.style.INFO(f'⏱ Tiempo de conexión a DB: {end_time - start_time:.2f} segundos'))
 
         # 2. Verificar Redis
         try:
             redis_conn = get_redis_connection("default")
+            # Timeouts cortos: un Redis colgado no debe bloquear el liveness probe
+            redis_conn.connection_pool.connection_kwargs.update(
+                socket_timeout=REDIS_TIMEOUT_S, socket_connect_timeout=REDIS_TIMEOUT_S
+            )
             redis_conn.ping()
             self.stdout.write(self.style.SUCCESS('✓ Redis: Conectado'))
-        except RedisConnectionError:
+        except (RedisConnectionError, RedisTimeoutError):
             self.stdout.write(self.style.ERROR('✗ Redis: Fallo de conexión'))
-            exit(1)
+            sys.exit(1)
         except Exception as e:
             # Fallback si django-redis no está configurado igual que celery
             self.stdout.write(self.style.WARNING(f'⚠ Redis check warning: {e}'))
@@ -1,41 +1,51 @@
 from django.core.management.base import BaseCommand
 from django.core.management import call_command
+from django.db import connection, transaction
 from django.utils import timezone
 from datetime import time
 import random
+from horarios.application.services.requerimientos_curso import poblar_curso_materia_requerida
 from horarios.models import (
     ConfiguracionColegio, BloqueHorario, Slot, Grado, Curso, Aula,
     Materia, Profesor, DisponibilidadProfesor, MateriaGrado, MateriaProfesor,
     CursoMateriaRequerida, MateriaRelleno
 )
 
+# Tamaño de lote para bulk_create: 500 filas x ~10 columnas queda muy por debajo del
+# límite de 65535 parámetros de PostgreSQL; en SQLite Django reduce el lote si hace falta.
+BULK_BATCH = 500
+
 class Command(BaseCommand):
     """
     Comando para poblar la base de datos con un escenario de prueba REALISTA.
     Crea configuración, bloques, cursos, profesores, materias y sus relaciones.
     
     WARNING: Borra todos los datos existentes antes de crear los nuevos.
+    Todo el proceso corre en una única transacción: si algo falla no queda un seed a medias.
     """
     help = 'Pobla la base de datos con un escenario de colegio REALISTA (seed)'
 
+    @transaction.atomic
     def handle(self, *args, **kwargs):
         self.stdout.write(self.style.WARNING('Iniciando proceso de seed REALISTA...'))
+        dias = ['lunes', 'martes', 'miércoles', 'jueves', 'viernes']
 
         # 1. Limpiar datos existentes
         self.stdout.write('Limpiando datos existentes...')
-        MateriaRelleno.objects.all().delete()
-        CursoMateriaRequerida.objects.all().delete()
-        MateriaProfesor.objects.all().delete()
-        MateriaGrado.objects.all().delete()
-        DisponibilidadProfesor.objects.all().delete()
-        Profesor.objects.all().delete()
-        Materia.objects.all().delete()
-        Curso.objects.all().delete()
-        Aula.objects.all().delete()
-        Grado.objects.all().delete()
-        Slot.objects.all().delete()
-        BloqueHorario.objects.all().delete()
-        ConfiguracionColegio.objects.all().delete()
+        modelos_a_purgar = (
+            MateriaRelleno, CursoMateriaRequerida, MateriaProfesor, MateriaGrado,
+            DisponibilidadProfesor, Profesor, Materia, Curso, Aula, Grado,
+            Slot, BloqueHorario, ConfiguracionColegio,
+        )
+        if connection.vendor == 'postgresql':
+            # TRUNCATE vacía todas las tablas en una sentencia; CASCADE alcanza a las
+            # dependientes (Horario, ProfesorSlot...) igual que el borrado en cascada de Django
+            tablas = ', '.join(connection.ops.quote_name(m._meta.db_table) for m in modelos_a_purgar)
+            with connection.cursor() as cursor:
+                cursor.execute(f'TRUNCATE {tablas} RESTART IDENTITY CASCADE')
+        else:
+            for modelo in modelos_a_purgar:
+                modelo.objects.all().delete()
 
         # 2. Configuración del Colegio (Jornada Mañana, 6 horas académicas)
         self.stdout.write('Creando configuración del colegio...')
@@ -43,7 +53,7 @@ class Command(BaseCommand):
             jornada='mañana',
             bloques_por_dia=6,
             duracion_bloque=55, # 55 min clases
-            dias_clase='lunes,martes,miércoles,jueves,viernes'
+            dias_clase=','.join(dias)
         )
 
         # 3. Bloques Horarios (7:00 AM - 1:30 PM aprox)
@@ -60,71 +70,67 @@ class Command(BaseCommand):
         ]
         
         # Bloques de clase (excluyendo descansos para el contador oficial)
+        # Los descansos no llevan número secuencial de bloque de clase en este modelo simple,
+        # así que solo se crean los bloques de clase.
         bloques_clase_indices = [0, 1, 3, 4, 6, 7] 
-        numero_bloque = 1
-        
-        for i, (inicio, fin) in enumerate(horas):
-            if i in bloques_clase_indices:
-                BloqueHorario.objects.create(numero=numero_bloque, hora_inicio=inicio, hora_fin=fin, tipo='clase')
-                numero_bloque += 1
-            else:
-                # Los descansos no llevan número secuencial de bloque de clase en este modelo simple, 
-                # pero los creamos para referencia visual si fuera necesario, o los omitimos de BloqueHorario
-                # si solo nos importan los de clase. Para Slots sí los necesitamos si queremos mostrar huecos.
-                pass
+        bloques_db = [
+            BloqueHorario(numero=numero, hora_inicio=horas[i][0], hora_fin=horas[i][1], tipo='clase')
+            for numero, i in enumerate(bloques_clase_indices, start=1)
+        ]
+        BloqueHorario.objects.bulk_create(bloques_db, batch_size=BULK_BATCH)
 
         # 4. Slots (Lunes a Viernes)
         self.stdout.write('Creando slots...')
-        dias = ['lunes', 'martes', 'miércoles', 'jueves', 'viernes']
-        # Recuperamos los bloques creados
-        bloques_db = list(BloqueHorario.objects.filter(tipo='clase').order_by('numero'))
-        
-        for dia in dias:
-            for b_obj in bloques_db:
-                Slot.objects.create(
-                    dia=dia,
-                    bloque=b_obj.numero,
-                    hora_inicio=b_obj.hora_inicio,
-                    hora_fin=b_obj.hora_fin,
-                    tipo='clase'
-                )
+        Slot.objects.bulk_create([
+            Slot(
+                dia=dia,
+                bloque=b_obj.numero,
+                hora_inicio=b_obj.hora_inicio,
+                hora_fin=b_obj.hora_fin,
+                tipo='clase'
+            )
+            for dia in dias for b_obj in bloques_db
+        ], batch_size=BULK_BATCH)
 
         # 5. Grados y Cursos (6º a 11º, dos grupos A y B) -> 12 Cursos
         self.stdout.write('Creando grados y cursos...')
         grados_config = ['SEXTO', 'SEPTIMO', 'OCTAVO', 'NOVENO', 'DECIMO', 'ONCE']
-        cursos_objs = []
-        grados_objs = {} # Mapa nombre -> objeto
+        Grado.objects.bulk_create([Grado(nombre=n) for n in grados_config], batch_size=BULK_BATCH)
+        # Se recargan por nombre: bulk_create no asigna pk en todos los motores (MySQL)
+        grados_objs = {g.nombre: g for g in Grado.objects.all()} # Mapa nombre -> objeto
         
-        for nombre_grado in grados_config:
-            grado = Grado.objects.create(nombre=nombre_grado)
-            grados_objs[nombre_grado] = grado
-            
-            for grupo in ['A', 'B']:
-                nombre_curso = f"{nombre_grado} {grupo}"
-                # Aula normal
-                aula = Aula.objects.create(
-                    nombre=f"Salón {nombre_curso}",
-                    tipo='comun',
-                    capacidad=40
-                )
-                curso = Curso.objects.create(
-                    nombre=nombre_curso,
-                    grado=grado,
-                    aula_fija=aula
-                )
-                cursos_objs.append(curso)
+        nombres_cursos = [
+            (nombre_grado, f"{nombre_grado} {grupo}")
+            for nombre_grado in grados_config for grupo in ['A', 'B']
+        ]
 
-        # 6. Aulas Especiales
-        self.stdout.write('Creando aulas especiales...')
-        aulas_especiales = [
-            Aula.objects.create(nombre="Laboratorio Química", tipo='laboratorio', capacidad=30),
-            Aula.objects.create(nombre="Laboratorio Física", tipo='laboratorio', capacidad=30),
-            Aula.objects.create(nombre="Sala de Sistemas 1", tipo='tecnologia', capacidad=40),
-            Aula.objects.create(nombre="Sala de Sistemas 2", tipo='tecnologia', capacidad=40),
-            Aula.objects.create(nombre="Sala de Arte", tipo='arte', capacidad=35),
-            Aula.objects.create(nombre="Cancha Múltiple", tipo='educacion_fisica', capacidad=100),
-            Aula.objects.create(nombre="Patio Central", tipo='educacion_fisica', capacidad=100),
+        # 6. Aulas (una normal por curso + especiales) en un solo lote
+        self.stdout.write('Creando aulas...')
+        aulas = [
+            Aula(nombre=f"Salón {nombre_curso}", tipo='comun', capacidad=40)
+            for _, nombre_curso in nombres_cursos
+        ]
+        aulas += [
+            Aula(nombre="Laboratorio Química", tipo='laboratorio', capacidad=30),
+            Aula(nombre="Laboratorio Física", tipo='laboratorio', capacidad=30),
+            Aula(nombre="Sala de Sistemas 1", tipo='tecnologia', capacidad=40),
+            Aula(nombre="Sala de Sistemas 2", tipo='tecnologia', capacidad=40),
+            Aula(nombre="Sala de Arte", tipo='arte', capacidad=35),
+            Aula(nombre="Cancha Múltiple", tipo='educacion_fisica', capacidad=100),
+            Aula(nombre="Patio Central", tipo='educacion_fisica', capacidad=100),
         ]
+        Aula.objects.bulk_create(aulas, batch_size=BULK_BATCH)
+        aulas_por_nombre = {a.nombre: a for a in Aula.objects.all()}
+
+        Curso.objects.bulk_create([
+            Curso(
+                nombre=nombre_curso,
+                grado_id=grados_objs[nombre_grado].pk,
+                aula_fija_id=aulas_por_nombre[f"Salón {nombre_curso}"].pk
+            )
+            for nombre_grado, nombre_curso in nombres_cursos
+        ], batch_size=BULK_BATCH)
+        cursos_objs = list(Curso.objects.all())  # Recargados con pk, igual que los grados
 
         # 7. Definición de Materias (Plan de Estudios)
         self.stdout.write('Definiendo materias...')
@@ -180,60 +186,48 @@ class Command(BaseCommand):
             {'nombre': 'Religión', 'bloques': 1},
         ]
 
-        # Crear objetos Materia (unificando nombres para evitar duplicados si coinciden)
-        # Usaremos un diccionario para no repetir materias si tienen el mismo nombre
-        materias_db = {} 
+        # Crear objetos Materia (unificando nombres para evitar duplicados si coinciden).
+        # Las materias compartidas entre planes (Educación Física, Ética, Religión) tienen
+        # la misma definición en ambos, así que basta con quedarse con una por nombre.
+        materias_plan = {m['nombre']: m for m in plan_basica + plan_media}
         
-        def get_or_create_materia(data):
-            nombre = data['nombre']
-            if nombre in materias_db:
-                return materias_db[nombre]
-            
-            req_aula = 'aula_tipo' in data
-            m_obj = Materia.objects.create(
+        # Si requiere aula especial, el modelo Materia solo guarda el booleano
+        # 'requiere_aula_especial'; la lógica de 'tipo' de aula se maneja en el validador o asignación.
+        Materia.objects.bulk_create([
+            Materia(
                 nombre=nombre,
                 bloques_por_semana=data['bloques'], # Default, se sobreescribe en CursoMateriaRequerida
-                requiere_aula_especial=req_aula,
-                # Si requiere aula especial, mapeamos el tipo en la lógica de asignación, 
-                # pero el modelo Materia solo tiene booleano 'requiere_aula_especial'.
-                # La lógica de 'tipo' de aula se maneja en el validador o asignación.
-                # Para simplificar, asumiremos que si requiere aula especial, cualquiera de ese "tipo" sirve,
-                # pero el modelo actual solo pide "aula especial" vs "comun".
-                # (Mejoraremos esto asumiendo que el algoritmo busca un aula del tipo correcto si implementamos esa lógica,
-                # por ahora lo marcamos como especial).
+                requiere_aula_especial='aula_tipo' in data,
             )
-            # Guardamos el tipo de aula preferido en un atributo temporal para usarlo al asignar profes o reglas
-            m_obj.tipo_aula_preferido = data.get('aula_tipo', 'comun')
-            materias_db[nombre] = m_obj
-            return m_obj
-
-        # Crear todas las materias
-        for m in plan_basica: get_or_create_materia(m)
-        for m in plan_media: get_or_create_materia(m)
+            for nombre, data in materias_plan.items()
+        ], batch_size=BULK_BATCH)
+        materias_db = {m.nombre: m for m in Materia.objects.filter(es_relleno=False)}
 
         # 8. Asignar Materias a Grados
         self.stdout.write('Asignando materias a grados...')
         
-        # Asignar materia de relleno a todos los grados
-        materia_relleno = Materia.objects.get(nombre="Actividad Complementaria")
-        for grado_obj in grados_objs.values():
-             MateriaGrado.objects.get_or_create(grado=grado_obj, materia=materia_relleno)
+        # Asignar materia de relleno a todos los grados (se reutiliza el objeto creado en el paso 7)
+        materias_grado = [
+            MateriaGrado(grado_id=grado_obj.pk, materia_id=materia_relleno.pk)
+            for grado_obj in grados_objs.values()
+        ]
 
         # 6º a 9º
         grados_basica = ['SEXTO', 'SEPTIMO', 'OCTAVO', 'NOVENO']
-        for g_nom in grados_basica:
-            grado = grados_objs[g_nom]
-            for m_data in plan_basica:
-                m_obj = materias_db[m_data['nombre']]
-                MateriaGrado.objects.get_or_create(grado=grado, materia=m_obj)
+        materias_grado += [
+            MateriaGrado(grado_id=grados_objs[g_nom].pk, materia_id=materias_db[m_data['nombre']].pk)
+            for g_nom in grados_basica for m_data in plan_basica
+        ]
 
         # 10º a 11º
         grados_media = ['DECIMO', 'ONCE']
-        for g_nom in grados_media:
-            grado = grados_objs[g_nom]
-            for m_data in plan_media:
-                m_obj = materias_db[m_data['nombre']]
-                MateriaGrado.objects.get_or_create(grado=grado, materia=m_obj)
+        materias_grado += [
+            MateriaGrado(grado_id=grados_objs[g_nom].pk, materia_id=materias_db[m_data['nombre']].pk)
+            for g_nom in grados_media for m_data in plan_media
+        ]
+
+        # ignore_conflicts conserva la semántica de get_or_create sin un SELECT por fila
+        MateriaGrado.objects.bulk_create(materias_grado, ignore_conflicts=True, batch_size=BULK_BATCH)
 
         # 9. Profesores (Staff Grande)
         self.stdout.write('Contratando profesores...')
@@ -274,66 +268,56 @@ class Command(BaseCommand):
             ('Prof. Francisco', ['Religión', 'Ética']),
         ]
 
-        profesores_objs = []
-        for nombre, especialidades in staff:
-            prof = Profesor.objects.create(nombre=nombre)
-            profesores_objs.append(prof)
-            
-            # Disponibilidad (todos tiempo completo 7-1:30 para simplificar, algunos con huecos)
-            # Para hacerlo realista, vamos a darles un día libre aleatorio o tardes libres (que no aplican aquí pq es jornada mañana)
-            # Daremos disponibilidad completa para maximizar factibilidad inicial
-            for dia in dias:
-                DisponibilidadProfesor.objects.create(
-                    profesor=prof, dia=dia, bloque_inicio=1, bloque_fin=6
-                )
-            
-            # Asignar especialidades (MateriaProfesor)
-            for esp in especialidades:
-                if esp in materias_db:
-                    MateriaProfesor.objects.create(profesor=prof, materia=materias_db[esp])
+        # Fase 1: todos los profesores en un lote (recargados por nombre para tener pk)
+        Profesor.objects.bulk_create([Profesor(nombre=nombre) for nombre, _ in staff], batch_size=BULK_BATCH)
+        prof_by_name = {p.nombre: p for p in Profesor.objects.all()}
+        
+        # Fase 2: relaciones construidas en memoria a partir de las referencias anteriores
+        # Disponibilidad (todos tiempo completo 7-1:30 para simplificar, algunos con huecos)
+        # Para hacerlo realista, vamos a darles un día libre aleatorio o tardes libres (que no aplican aquí pq es jornada mañana)
+        # Daremos disponibilidad completa para maximizar factibilidad inicial
+        DisponibilidadProfesor.objects.bulk_create([
+            DisponibilidadProfesor(profesor_id=prof.pk, dia=dia, bloque_inicio=1, bloque_fin=6)
+            for prof in prof_by_name.values() for dia in dias
+        ], batch_size=BULK_BATCH)
+        
+        # Asignar especialidades (MateriaProfesor)
+        MateriaProfesor.objects.bulk_create([
+            MateriaProfesor(profesor_id=prof_by_name[nombre].pk, materia_id=materias_db[esp].pk)
+            for nombre, especialidades in staff
+            for esp in especialidades if esp in materias_db
+        ], batch_size=BULK_BATCH)
 
         # 10. Poblar CursoMateriaRequerida
         self.stdout.write('Generando requerimientos de cursos...')
-        # call_command('poblar_curso_materia_requerida', force=True) # Comando no existe, lo hacemos manual
-        
-        # Lógica manual de sync_aux_tables._sync_curso_materia_requerida
-        curso_por_grado = {}
-        for c in Curso.objects.all().only('id','grado_id'):
-            curso_por_grado.setdefault(c.grado_id, []).append(c.id)
-            
-        rows = []
-        for mg in MateriaGrado.objects.select_related('materia').all():
-            bloques = mg.materia.bloques_por_semana
-            for curso_id in curso_por_grado.get(mg.grado_id, []):
-                rows.append(CursoMateriaRequerida(curso_id=curso_id, materia_id=mg.materia_id, bloques_requeridos=bloques))
-                
-        # Limpiar y crear
-        CursoMateriaRequerida.objects.all().delete()
-        CursoMateriaRequerida.objects.bulk_create(rows, batch_size=1000)
+        # Las filas de MateriaGrado solo llevan *_id; las materias se resuelven en memoria
+        materia_por_id = {m.pk: m for m in (materia_relleno, *materias_db.values())}
+        materias_por_grado = {}
+        for mg in materias_grado:
+            materias_por_grado.setdefault(mg.grado_id, []).append(materia_por_id[mg.materia_id])
+        total_requeridas = poblar_curso_materia_requerida(cursos_objs, materias_por_grado)
         
-        # 11. Configurar Materia de Relleno (Asignar a todos los grados y un profesor comodín)
+        # 11. Configurar Materia de Relleno (profesor comodín)
         self.stdout.write('Configurando materia de relleno...')
-        materia_relleno = Materia.objects.get(nombre="Actividad Complementaria")
         
-        # Asignar a todos los grados
-        for grado in Grado.objects.all():
-            MateriaGrado.objects.get_or_create(grado=grado, materia=materia_relleno)
-            
+        # La materia de relleno ya quedó asignada a todos los grados en el paso 8.
         # Asignar a un profesor (o varios)
-        prof_comodin, _ = Profesor.objects.get_or_create(
+        prof_comodin, comodin_creado = Profesor.objects.get_or_create(
             nombre="Prof. Monitor",
             defaults={'max_bloques_por_semana': 50, 'puede_dictar_relleno': True}
         )
         # Dar disponibilidad completa al comodín
-        for dia in dias:
-            DisponibilidadProfesor.objects.get_or_create(
-                profesor=prof_comodin, dia=dia, bloque_inicio=1, bloque_fin=6
-            )
+        DisponibilidadProfesor.objects.bulk_create([
+            DisponibilidadProfesor(profesor_id=prof_comodin.pk, dia=dia, bloque_inicio=1, bloque_fin=6)
+            for dia in dias
+        ], ignore_conflicts=True, batch_size=BULK_BATCH)
             
-        MateriaProfesor.objects.get_or_create(profesor=prof_comodin, materia=materia_relleno)
         # También asignamos a Francisco (Ética/Religión) como apoyo
-        prof_francisco = Profesor.objects.get(nombre="Prof. Francisco")
-        MateriaProfesor.objects.get_or_create(profesor=prof_francisco, materia=materia_relleno)
+        prof_francisco = prof_by_name["Prof. Francisco"]
+        MateriaProfesor.objects.bulk_create([
+            MateriaProfesor(profesor_id=prof_comodin.pk, materia_id=materia_relleno.pk),
+            MateriaProfesor(profesor_id=prof_francisco.pk, materia_id=materia_relleno.pk),
+        ], ignore_conflicts=True, batch_size=BULK_BATCH)
 
         # Ajustar bloques requeridos específicos por grado (ya que Materia tiene un default, 
         # pero CursoMateriaRequerida se creó con ese default. Si queremos variar bloques por grado
@@ -341,8 +325,10 @@ class Command(BaseCommand):
         # En este seed, los defaults del plan coinciden con lo creado en Materia, así que está bien).
 
         self.stdout.write(self.style.SUCCESS(f'¡Seed REALISTA completado!'))
-        self.stdout.write(f"- Cursos: {Curso.objects.count()} (12 grupos)")
-        self.stdout.write(f"- Materias: {Materia.objects.count()}")
-        self.stdout.write(f"- Profesores: {Profesor.objects.count()}")
-        self.stdout.write(f"- Bloques Totales a Programar: {CursoMateriaRequerida.objects.count() * 5} aprox (depende de horas/materia)")
+        # Totales tomados de lo construido en memoria (sin COUNT(*) adicionales)
+        total_profesores = len(prof_by_name) + (1 if comodin_creado else 0)
+        self.stdout.write(f"- Cursos: {len(cursos_objs)} (12 grupos)")
+        self.stdout.write(f"- Materias: {len(materias_db) + 1}")
+        self.stdout.write(f"- Profesores: {total_profesores}")
+        self.stdout.write(f"- Bloques Totales a Programar: {total_requeridas * 5} aprox (depende de horas/materia)")
 
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
-from horarios.models import Slot, BloqueHorario, DisponibilidadProfesor, ProfesorSlot, Curso, Materia, MateriaGrado, CursoMateriaRequerida
+from horarios.application.services.requerimientos_curso import poblar_curso_materia_requerida
+from horarios.models import Slot, BloqueHorario, DisponibilidadProfesor, ProfesorSlot, Curso, Materia, MateriaGrado
 
 class Command(BaseCommand):
 	help = "Materializa ProfesorSlot y sincroniza CursoMateriaRequerida (Tablas Auxiliares)"
@@ -27,7 +28,7 @@ class Command(BaseCommand):
 	def _sync_slots(self):
 		from horarios.models import ConfiguracionColegio
 		conf = ConfiguracionColegio.objects.first()
-		dias = [d.strip() for d in (conf.dias_clase if conf else 'lunes,martes,miércoles,jueves,viernes').split(',')]
+		dias = conf.lista_dias_clase if conf else ['lunes', 'martes', 'miércoles', 'jueves', 'viernes']
 		with transaction.atomic():
 			Slot.objects.all().delete()
 			bloques = list(BloqueHorario.objects.filter(tipo='clase').order_by('numero').values('numero','hora_inicio','hora_fin','tipo'))
@@ -53,14 +54,7 @@ class Command(BaseCommand):
 	def _sync_curso_materia_requerida(self):
 		# Derivar bloques_requeridos por curso-materia desde MateriaGrado y Materia.bloques_por_semana
 		# Asignamos a cada curso de un grado los bloques de cada materia del plan del grado
-		curso_por_grado = {}
-		for c in Curso.objects.all().only('id','grado_id'):
-			curso_por_grado.setdefault(c.grado_id, []).append(c.id)
-		rows = []
+		materias_por_grado = {}
 		for mg in MateriaGrado.objects.select_related('materia').all():
-			bloques = mg.materia.bloques_por_semana
-			for curso_id in curso_por_grado.get(mg.grado_id, []):
-				rows.append(CursoMateriaRequerida(curso_id=curso_id, materia_id=mg.materia_id, bloques_requeridos=bloques))
-		with transaction.atomic():
-			CursoMateriaRequerida.objects.all().delete()
-			CursoMateriaRequerida.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+			materias_por_grado.setdefault(mg.grado_id, []).append(mg.materia)
+		poblar_curso_materia_requerida(Curso.objects.all().only('id','grado_id'), materias_por_grado)
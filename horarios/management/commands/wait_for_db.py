@@ -1,39 +1,57 @@
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from django.db import connections
 from django.db.utils import OperationalError
 from django.core.management.base import BaseCommand
 import redis
 from django.conf import settings
 
+# Backoff exponencial entre intentos (segundos)
+ESPERA_INICIAL_S = 0.05
+ESPERA_MAXIMA_S = 1.0
+
 class Command(BaseCommand):
     help = 'Espera a que la base de datos y Redis estén disponibles'
 
     def handle(self, *args, **options):
         self.stdout.write('Esperando servicios...')
 
-        # 1. Esperar DB
-        db_conn = None
-        while not db_conn:
+        # DB y Redis se comprueban en paralelo; se espera al más lento de los dos
+        self._cancelado = threading.Event()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            esperas = [executor.submit(self._esperar_db)]
+            if hasattr(settings, 'CELERY_BROKER_URL'):
+                esperas.append(executor.submit(self._esperar_redis, settings.CELERY_BROKER_URL))
             try:
-                db_conn = connections['default']
-                db_conn.cursor() # Intenta conectar
-                self.stdout.write(self.style.SUCCESS('Base de datos disponible!'))
-            except OperationalError:
-                self.stdout.write('Base de datos no disponible, esperando 1 segundo...')
-                time.sleep(1)
-
-        # 2. Esperar Redis (si está configurado)
-        if hasattr(settings, 'CELERY_BROKER_URL'):
-            redis_url = settings.CELERY_BROKER_URL
-            redis_up = False
-            while not redis_up:
-                try:
-                    r = redis.from_url(redis_url)
-                    r.ping()
-                    self.stdout.write(self.style.SUCCESS('Redis disponible!'))
-                    redis_up = True
-                except redis.ConnectionError:
-                    self.stdout.write('Redis no disponible, esperando 1 segundo...')
-                    time.sleep(1)
+                for espera in esperas:
+                    espera.result()
+            finally:
+                # Ante Ctrl+C o error, los hilos dejan de reintentar y el executor puede cerrar
+                self._cancelado.set()
 
         self.stdout.write(self.style.SUCCESS('Todos los servicios están listos!'))
+
+    def _esperar(self, comprobar, errores, nombre):
+        """Reintenta `comprobar` con backoff exponencial hasta que no lance `errores`."""
+        espera = ESPERA_INICIAL_S
+        while not self._cancelado.is_set():
+            try:
+                comprobar()
+                self.stdout.write(self.style.SUCCESS(f'{nombre} disponible!'))
+                return
+            except errores:
+                self.stdout.write(f'{nombre} no disponible, reintentando en {espera:.2f}s...')
+                self._cancelado.wait(espera)
+                espera = min(espera * 2, ESPERA_MAXIMA_S)
+
+    def _esperar_db(self):
+        # La conexión es local al hilo: se cierra al terminar para no dejarla abierta
+        db_conn = connections['default']
+        try:
+            self._esperar(db_conn.ensure_connection, OperationalError, 'Base de datos')
+        finally:
+            db_conn.close()
+
+    def _esperar_redis(self, redis_url):
+        r = redis.from_url(redis_url)
+        self._esperar(r.ping, redis.ConnectionError, 'Redis')
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.2 on 2026-10-17 04:05
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('horarios', '0011_remove_runmetric_run_alter_runmetric_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='aula',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('nombre'), name='uniq_aula_nombre_ci', violation_error_message='Ya existe un aula con este nombre.'),
+        ),
+        migrations.AddConstraint(
+            model_name='curso',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('nombre'), name='uniq_curso_nombre_ci', violation_error_message='Ya existe un curso con este nombre.'),
+        ),
+        migrations.AddConstraint(
+            model_name='grado',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('nombre'), name='uniq_grado_nombre_ci', violation_error_message='Ya existe un grado con este nombre.'),
+        ),
+        migrations.AddConstraint(
+            model_name='materia',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('nombre'), name='uniq_materia_nombre_ci', violation_error_message='Ya existe una materia con este nombre.'),
+        ),
+        migrations.AddConstraint(
+            model_name='profesor',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('nombre'), name='uniq_profesor_nombre_ci', violation_error_message='Ya existe un profesor con este nombre.'),
+        ),
+    ]
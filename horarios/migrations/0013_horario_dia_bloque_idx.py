@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-17 04:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('horarios', '0012_nombre_unico_ci'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='horario',
+            index=models.Index(fields=['dia', 'bloque'], name='horario_dia_bloque_idx'),
+        ),
+    ]
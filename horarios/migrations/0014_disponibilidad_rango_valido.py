@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-17 04:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('horarios', '0013_horario_dia_bloque_idx'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='disponibilidadprofesor',
+            constraint=models.CheckConstraint(check=models.Q(('bloque_inicio__lte', models.F('bloque_fin'))), name='disponibilidad_rango_valido', violation_error_message='El bloque de inicio no puede ser mayor al bloque final.'),
+        ),
+    ]
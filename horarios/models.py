@@ -1,19 +1,25 @@
-from django.db import models
+from django.db import connection, models
+from django.db.models.functions import Lower
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 import re
 from django.utils import timezone
 
+# Patrones de nombres compilados una sola vez (se evalúan en cada full_clean)
+_NOMBRE_RE = re.compile(r'^[A-ZÁÉÍÓÚÑ][a-záéíóúñ\s]+$')
+_GRADO_RE = re.compile(r'^[A-Z0-9\s]+$')
+_AULA_RE = re.compile(r'^[A-Z0-9\s\-]+$')
+
 def validate_nombre_profesor(value):
     """Valida que el nombre del profesor tenga el formato correcto"""
-    if not re.match(r'^[A-ZÁÉÍÓÚÑ][a-záéíóúñ\s]+$', value):
+    if not _NOMBRE_RE.match(value):
         raise ValidationError('El nombre debe empezar con mayúscula y contener solo letras y espacios.')
     if len(value.strip()) < 2:
         raise ValidationError('El nombre debe tener al menos 2 caracteres.')
 
 def validate_nombre_materia(value):
     """Valida que el nombre de la materia tenga el formato correcto"""
-    if not re.match(r'^[A-ZÁÉÍÓÚÑ][a-záéíóúñ\s]+$', value):
+    if not _NOMBRE_RE.match(value):
         raise ValidationError('El nombre debe empezar con mayúscula y contener solo letras y espacios.')
     if len(value.strip()) < 2:
         raise ValidationError('El nombre debe tener al menos 2 caracteres.')
@@ -32,6 +38,8 @@ def validate_capacidad_aula(value):
     if value > 200:
         raise ValidationError('La capacidad no puede ser mayor a 200.')
 
+DIAS_VALIDOS = frozenset(['lunes', 'martes', 'miércoles', 'jueves', 'viernes', 'sábado', 'domingo'])
+
 class ConfiguracionColegio(models.Model):
     """
     Configuración global del colegio.
@@ -51,12 +59,15 @@ class ConfiguracionColegio(models.Model):
 
     def clean(self):
         super().clean()
-        dias_validos = ['lunes', 'martes', 'miércoles', 'jueves', 'viernes', 'sábado', 'domingo']
-        dias_ingresados = [dia.strip() for dia in self.dias_clase.split(',')]
-        for dia in dias_ingresados:
-            if dia not in dias_validos:
+        for dia in self.lista_dias_clase:
+            if dia not in DIAS_VALIDOS:
                 raise ValidationError(f'Día inválido: {dia}')
 
+    @property
+    def lista_dias_clase(self):
+        """Días de clase como lista (dias_clase se guarda como CSV)"""
+        return [dia.strip() for dia in self.dias_clase.split(',')]
+
     def __str__(self):
         return f"Jornada {self.jornada} - {self.bloques_por_dia} bloques/día"
 
@@ -83,11 +94,14 @@ class Profesor(models.Model):
         help_text="Área de especialidad del profesor"
     )
 
-    def clean(self):
-        super().clean()
-        # Verificar que no exista otro profesor con el mismo nombre
-        if Profesor.objects.filter(nombre__iexact=self.nombre).exclude(id=self.id).exists():
-            raise ValidationError('Ya existe un profesor con este nombre.')
+    class Meta:
+        # Unicidad sin distinguir mayúsculas; full_clean() la valida vía validate_constraints()
+        constraints = [
+            models.UniqueConstraint(
+                Lower('nombre'), name='uniq_profesor_nombre_ci',
+                violation_error_message='Ya existe un profesor con este nombre.'
+            ),
+        ]
 
     def __str__(self):
         return self.nombre
@@ -111,13 +125,21 @@ class DisponibilidadProfesor(models.Model):
 
     def clean(self):
         super().clean()
-        if self.bloque_inicio > self.bloque_fin:
-            raise ValidationError('El bloque de inicio no puede ser mayor al bloque final.')
+        # inicio <= fin lo garantiza la CheckConstraint (full_clean la valida con el mismo mensaje).
+        # El tope de 8 bloques queda como regla de formulario: SolverView carga disponibilidad
+        # de jornada completa (hasta 12 bloques) sin pasar por clean()
         if self.bloque_fin - self.bloque_inicio > 8:
             raise ValidationError('La disponibilidad no puede abarcar más de 8 bloques consecutivos.')
 
     class Meta:
         unique_together = ['profesor', 'dia']
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(bloque_inicio__lte=models.F('bloque_fin')),
+                name='disponibilidad_rango_valido',
+                violation_error_message='El bloque de inicio no puede ser mayor al bloque final.'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.profesor} - {self.dia} Bloques {self.bloque_inicio}-{self.bloque_fin}"
@@ -170,10 +192,6 @@ class Materia(models.Model):
 
     def clean(self):
         super().clean()
-        # Verificar que no exista otra materia con el mismo nombre
-        if Materia.objects.filter(nombre__iexact=self.nombre).exclude(id=self.id).exists():
-            raise ValidationError('Ya existe una materia con este nombre.')
-        
         # Validaciones específicas para materias de relleno
         if self.es_relleno:
             if self.prioridad < 5:
@@ -181,6 +199,14 @@ class Materia(models.Model):
             if self.tipo_materia not in ['relleno', 'proyecto']:
                 self.tipo_materia = 'relleno'
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                Lower('nombre'), name='uniq_materia_nombre_ci',
+                violation_error_message='Ya existe una materia con este nombre.'
+            ),
+        ]
+
     def __str__(self):
         tipo_str = " (Relleno)" if self.es_relleno else ""
         return f"{self.nombre}{tipo_str}"
@@ -193,18 +219,23 @@ class MateriaProfesor(models.Model):
     profesor = models.ForeignKey(Profesor, on_delete=models.CASCADE)
     materia = models.ForeignKey(Materia, on_delete=models.CASCADE)
 
-    def clean(self):
-        super().clean()
-        # Verificar que no exista la misma asignación
-        if MateriaProfesor.objects.filter(profesor=self.profesor, materia=self.materia).exclude(id=self.id).exists():
-            raise ValidationError('Esta asignación de profesor-materia ya existe.')
-
     class Meta:
         unique_together = ['profesor', 'materia']
 
     def __str__(self):
         return f"{self.profesor} - {self.materia}"
 
+    @classmethod
+    def crear_en_lote(cls, pares):
+        """
+        Inserta pares (profesor_id, materia_id) en un solo INSERT por lote; los que ya
+        existen los descarta la restricción unique_together.
+        """
+        cls.objects.bulk_create(
+            [cls(profesor_id=profesor_id, materia_id=materia_id) for profesor_id, materia_id in pares],
+            ignore_conflicts=True, batch_size=1000
+        )
+
 class Grado(models.Model):
     """
     Nivel educativo (ej. 1° Año, 2° Año).
@@ -214,10 +245,16 @@ class Grado(models.Model):
 
     def clean(self):
         super().clean()
-        if not re.match(r'^[A-Z0-9\s]+$', self.nombre):
+        if not _GRADO_RE.match(self.nombre):
             raise ValidationError('El nombre del grado debe contener solo letras mayúsculas, números y espacios.')
-        if Grado.objects.filter(nombre__iexact=self.nombre).exclude(id=self.id).exists():
-            raise ValidationError('Ya existe un grado con este nombre.')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                Lower('nombre'), name='uniq_grado_nombre_ci',
+                violation_error_message='Ya existe un grado con este nombre.'
+            ),
+        ]
 
     def __str__(self):
         return self.nombre
@@ -229,17 +266,23 @@ class MateriaGrado(models.Model):
     grado = models.ForeignKey(Grado, on_delete=models.CASCADE)
     materia = models.ForeignKey(Materia, on_delete=models.CASCADE)
 
-    def clean(self):
-        super().clean()
-        if MateriaGrado.objects.filter(grado=self.grado, materia=self.materia).exclude(id=self.id).exists():
-            raise ValidationError('Esta asignación de materia-grado ya existe.')
-
     class Meta:
         unique_together = ['grado', 'materia']
 
     def __str__(self):
         return f"{self.grado} - {self.materia}"
 
+    @classmethod
+    def crear_en_lote(cls, pares):
+        """
+        Inserta pares (grado_id, materia_id) en un solo INSERT por lote; los que ya
+        existen los descarta la restricción unique_together.
+        """
+        cls.objects.bulk_create(
+            [cls(grado_id=grado_id, materia_id=materia_id) for grado_id, materia_id in pares],
+            ignore_conflicts=True, batch_size=1000
+        )
+
 class Curso(models.Model):
     """
     División específica de un grado (ej. 1° Año 'A').
@@ -251,10 +294,16 @@ class Curso(models.Model):
 
     def clean(self):
         super().clean()
-        if not re.match(r'^[A-Z0-9\s]+$', self.nombre):
+        if not _GRADO_RE.match(self.nombre):
             raise ValidationError('El nombre del curso debe contener solo letras mayúsculas, números y espacios.')
-        if Curso.objects.filter(nombre__iexact=self.nombre).exclude(id=self.id).exists():
-            raise ValidationError('Ya existe un curso con este nombre.')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                Lower('nombre'), name='uniq_curso_nombre_ci',
+                violation_error_message='Ya existe un curso con este nombre.'
+            ),
+        ]
 
     def __str__(self):
         return self.nombre
@@ -276,10 +325,16 @@ class Aula(models.Model):
 
     def clean(self):
         super().clean()
-        if not re.match(r'^[A-Z0-9\s\-]+$', self.nombre):
+        if not _AULA_RE.match(self.nombre):
             raise ValidationError('El nombre del aula debe contener solo letras mayúsculas, números, espacios y guiones.')
-        if Aula.objects.filter(nombre__iexact=self.nombre).exclude(id=self.id).exists():
-            raise ValidationError('Ya existe un aula con este nombre.')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                Lower('nombre'), name='uniq_aula_nombre_ci',
+                violation_error_message='Ya existe un aula con este nombre.'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.nombre} ({self.tipo})"
@@ -342,6 +397,22 @@ class Slot(models.Model):
     def __str__(self):
         return f"{self.dia} - Bloque {self.bloque} ({self.tipo})"
 
+class HorarioManager(models.Manager):
+    """
+    Carga por defecto las FK que muestran __str__, el admin y HorarioSerializer,
+    para que listar o exportar horarios sea un único SELECT con JOIN en vez de N+1.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('curso__grado', 'materia', 'profesor', 'aula')
+
+    def asignaciones(self):
+        """
+        Tuplas (curso_id, profesor_id, materia_id, dia, bloque) sin JOIN ni instancias:
+        lo único que necesitan las comparaciones de horarios completos.
+        """
+        return super().get_queryset().values_list('curso_id', 'profesor_id', 'materia_id', 'dia', 'bloque')
+
 class Horario(models.Model):
     curso = models.ForeignKey(Curso, on_delete=models.CASCADE)
     materia = models.ForeignKey(Materia, on_delete=models.CASCADE)
@@ -355,26 +426,34 @@ class Horario(models.Model):
     )
     slot = models.ForeignKey('Slot', null=True, blank=True, on_delete=models.SET_NULL)
 
+    objects = HorarioManager()
+
     def clean(self):
         super().clean()
-        from django.core.exceptions import ValidationError
         
         # Verificar que el bloque sea de tipo 'clase'
-        bloque_obj = BloqueHorario.objects.filter(numero=self.bloque).first()
-        if bloque_obj and bloque_obj.tipo != 'clase':
-            raise ValidationError(f"No se pueden asignar clases en bloques tipo '{bloque_obj.tipo}'.")
+        tipo_bloque = BloqueHorario.objects.filter(numero=self.bloque).values_list('tipo', flat=True).first()
+        if tipo_bloque and tipo_bloque != 'clase':
+            raise ValidationError(f"No se pueden asignar clases en bloques tipo '{tipo_bloque}'.")
         
         # Verificar que el profesor tenga disponibilidad en ese día y bloque
         if not DisponibilidadProfesor.objects.filter(
-            profesor=self.profesor,
+            profesor_id=self.profesor_id,
             dia=self.dia,
             bloque_inicio__lte=self.bloque,
             bloque_fin__gte=self.bloque
         ).exists():
-            raise ValidationError(f"El profesor {self.profesor.nombre} no tiene disponibilidad en {self.dia} bloque {self.bloque}.")
+            # Solo se usa el nombre si el profesor ya está cargado: evita un SELECT por error
+            if self._meta.get_field('profesor').is_cached(self):
+                profesor = self.profesor.nombre
+            else:
+                profesor = f"id={self.profesor_id}"
+            raise ValidationError(f"El profesor {profesor} no tiene disponibilidad en {self.dia} bloque {self.bloque}.")
         
-        # Verificar que el aula sea apropiada para la materia
-        if self.aula and self.materia.requiere_aula_especial and self.aula.tipo == 'comun':
+        # Verificar que el aula sea apropiada para la materia. El aula fija del curso
+        # siempre es válida: es la regla dura que aplican el generador y los validadores
+        if (self.aula and self.materia.requiere_aula_especial and self.aula.tipo == 'comun'
+                and self.aula_id != self.curso.aula_fija_id):
             raise ValidationError(f"La materia {self.materia.nombre} requiere un aula especial, no un aula común.")
 
     class Meta:
@@ -387,6 +466,11 @@ class Horario(models.Model):
             models.UniqueConstraint(fields=['curso', 'slot'], name='uniq_horario_curso_slot'),
             models.UniqueConstraint(fields=['profesor', 'slot'], name='uniq_horario_profesor_slot'),
         ]
+        # (curso|profesor, dia) ya se resuelven con el prefijo de los unique_together;
+        # falta un índice para los recuentos por día/bloque de los reportes
+        indexes = [
+            models.Index(fields=['dia', 'bloque'], name='horario_dia_bloque_idx'),
+        ]
 
     def __str__(self):
         return f"{self.curso} - {self.materia} - {self.dia} Bloque {self.bloque}"
@@ -515,13 +599,11 @@ class ConfiguracionCurso(models.Model):
     
     def calcular_bloques_faltantes(self):
         """Calcula cuántos bloques de relleno se necesitan para completar el objetivo"""
-        # Obtener materias obligatorias del curso
-        materias_obligatorias = MateriaGrado.objects.filter(
-            grado=self.curso.grado,
+        # Bloques de las materias obligatorias del grado del curso, sumados en una sola consulta
+        total_obligatorios = MateriaGrado.objects.filter(
+            grado__curso=self.curso_id,
             materia__es_relleno=False
-        )
-        
-        total_obligatorios = sum(mg.materia.bloques_por_semana for mg in materias_obligatorias)
+        ).aggregate(total=models.Sum('materia__bloques_por_semana'))['total'] or 0
         faltantes = max(0, self.slots_objetivo - total_obligatorios)
         
         return min(faltantes, self.max_bloques_relleno)
@@ -660,26 +742,43 @@ class TrackerCorrida(models.Model):
         import hashlib
         import json
         
-        # Obtener estado del sistema
+        # Consultas que definen el estado del sistema
         estado = {
-            'cursos': list(Curso.objects.values('id', 'nombre', 'grado_id', 'aula_fija_id').order_by('id')),
-            'profesores': list(Profesor.objects.values('id', 'nombre').order_by('id')),
-            'materias': list(Materia.objects.values('id', 'nombre', 'bloques_por_semana').order_by('id')),
-            'materia_grado': list(MateriaGrado.objects.values('materia_id', 'grado_id').order_by('materia_id')),
-            'materia_profesor': list(MateriaProfesor.objects.values('materia_id', 'profesor_id').order_by('materia_id')),
-            'disponibilidad': list(DisponibilidadProfesor.objects.values('profesor_id', 'dia', 'bloque_inicio', 'bloque_fin').order_by('profesor_id')),
-            'bloques': list(BloqueHorario.objects.values('numero', 'tipo').order_by('numero')),
+            'cursos': Curso.objects.values('id', 'nombre', 'grado_id', 'aula_fija_id').order_by('id'),
+            'profesores': Profesor.objects.values('id', 'nombre').order_by('id'),
+            'materias': Materia.objects.values('id', 'nombre', 'bloques_por_semana').order_by('id'),
+            'materia_grado': MateriaGrado.objects.values('materia_id', 'grado_id').order_by('materia_id'),
+            'materia_profesor': MateriaProfesor.objects.values('materia_id', 'profesor_id').order_by('materia_id'),
+            'disponibilidad': DisponibilidadProfesor.objects.values('profesor_id', 'dia', 'bloque_inicio', 'bloque_fin').order_by('profesor_id'),
+            'bloques': BloqueHorario.objects.values('numero', 'tipo').order_by('numero'),
         }
         
-        # Convertir a JSON y calcular hash
-        estado_json = json.dumps(estado, sort_keys=True)
-        return hashlib.sha256(estado_json.encode()).hexdigest()
+        # Mismo resultado que sha256(json.dumps(estado, sort_keys=True)), pero serializando
+        # fila a fila desde iterator(): sin listas intermedias ni el JSON completo en memoria
+        hasher = hashlib.sha256()
+        hasher.update(b'{')
+        for i, clave in enumerate(sorted(estado)):
+            if i:
+                hasher.update(b', ')
+            hasher.update(f'{json.dumps(clave)}: ['.encode())
+            for j, fila in enumerate(estado[clave].iterator(chunk_size=2000)):
+                if j:
+                    hasher.update(b', ')
+                hasher.update(json.dumps(fila, sort_keys=True).encode())
+            hasher.update(b']')
+        hasher.update(b'}')
+        return hasher.hexdigest()
     
     def actualizar_estado_sistema(self):
         """Actualiza el estado del sistema con conteos actuales"""
-        self.num_cursos = Curso.objects.count()
-        self.num_profesores = Profesor.objects.count()
-        self.num_materias = Materia.objects.count()
+        # Los tres conteos en una sola consulta (subconsultas escalares)
+        conteos = ', '.join(
+            f'(SELECT COUNT(*) FROM {connection.ops.quote_name(modelo._meta.db_table)})'
+            for modelo in (Curso, Profesor, Materia)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT {conteos}')
+            self.num_cursos, self.num_profesores, self.num_materias = cursor.fetchone()
         self.estado_sistema_hash = self.calcular_hash_sistema()
     
     def es_reproducible(self):
@@ -722,7 +821,12 @@ class TrackerCorrida(models.Model):
             self.desviacion_balance_dia = metricas.get('desviacion_balance_dia', 0.0)
         
         self.timestamp_fin = timezone.now()
-        self.save()
+        # Sólo se reescriben las columnas de resultados (una corrida sin guardar se inserta completa)
+        self.save(update_fields=[
+            'exito', 'fitness_final', 'generaciones_completadas', 'convergencia', 'tiempo_total_s',
+            'num_solapes', 'num_huecos', 'porcentaje_primeras_ultimas', 'desviacion_balance_dia',
+            'timestamp_fin',
+        ] if self.pk else None)
     
     def marcar_como_fallida(self, error, tiempo_total):
         """Marca la corrida como fallida"""
@@ -730,12 +834,15 @@ class TrackerCorrida(models.Model):
         self.tiempo_total_s = tiempo_total
         self.timestamp_fin = timezone.now()
         self.comentarios = f"Error: {error}"
-        self.save()
+        self.save(update_fields=['exito', 'tiempo_total_s', 'timestamp_fin', 'comentarios'] if self.pk else None)
     
     @classmethod
     def obtener_mejores_corridas(cls, limite=10):
         """Obtiene las mejores corridas exitosas ordenadas por fitness"""
-        return cls.objects.filter(exito=True).order_by('fitness_final')[:limite]
+        # Sólo las columnas del ranking (y de __str__); el orden lo resuelve el índice (exito, fitness_final)
+        return cls.objects.filter(exito=True).order_by('fitness_final').only(
+            'run_id', 'timestamp_inicio', 'fitness_final', 'generaciones_completadas'
+        )[:limite]
     
     @classmethod
     def obtener_corridas_por_semilla(cls, semilla):
@@ -745,7 +852,8 @@ class TrackerCorrida(models.Model):
     @classmethod
     def obtener_corridas_reproducibles(cls):
         """Obtiene corridas que pueden reproducirse con el estado actual"""
-        corridas = cls.objects.filter(exito=True)
-        return [c for c in corridas if c.es_reproducible()]
+        # El hash del sistema se calcula una vez y el filtro usa el índice de estado_sistema_hash
+        hash_actual = cls().calcular_hash_sistema()
+        return cls.objects.filter(exito=True, estado_sistema_hash=hash_actual)
 
 
@@ -0,0 +1,55 @@
+from django.test import SimpleTestCase
+
+from horarios.domain.services.disponibilidad_bitmap import BitmapDisponibilidad
+
+
+class BitmapDisponibilidadTest(SimpleTestCase):
+    def test_rango_por_dia(self):
+        """Solo los bloques dentro de [inicio, fin] del día registrado están disponibles"""
+        bitmap = BitmapDisponibilidad([(1, 'lunes', 2, 4)])
+        self.assertFalse(bitmap.disponible(1, 'lunes', 1))
+        self.assertTrue(bitmap.disponible(1, 'lunes', 2))
+        self.assertTrue(bitmap.disponible(1, 'lunes', 4))
+        self.assertFalse(bitmap.disponible(1, 'lunes', 5))
+        self.assertFalse(bitmap.disponible(1, 'martes', 3))
+
+    def test_dias_fuera_de_lunes_a_viernes(self):
+        """Sábado, domingo o días sin tilde se tratan igual que cualquier otro día"""
+        bitmap = BitmapDisponibilidad([
+            (1, 'sábado', 1, 3),
+            (1, 'miercoles', 2, 2),
+            (2, 'domingo', 1, 1),
+        ])
+        self.assertTrue(bitmap.disponible(1, 'sábado', 3))
+        self.assertTrue(bitmap.disponible(1, 'miercoles', 2))
+        self.assertFalse(bitmap.disponible(1, 'miércoles', 2))
+        self.assertTrue(bitmap.disponible(2, 'domingo', 1))
+        self.assertFalse(bitmap.disponible(2, 'sábado', 1))
+
+    def test_bloque_fin_mayor_a_12(self):
+        """El ancho por día crece con el mayor bloque_fin sin pisar el día siguiente"""
+        bitmap = BitmapDisponibilidad([(1, 'lunes', 10, 15), (1, 'martes', 1, 1)])
+        self.assertTrue(bitmap.disponible(1, 'lunes', 15))
+        self.assertFalse(bitmap.disponible(1, 'lunes', 16))
+        self.assertTrue(bitmap.disponible(1, 'martes', 1))
+        self.assertFalse(bitmap.disponible(1, 'martes', 2))
+
+    def test_varias_filas_mismo_profesor(self):
+        """Las filas de un mismo profesor se acumulan"""
+        bitmap = BitmapDisponibilidad([
+            (1, 'lunes', 1, 2),
+            (1, 'lunes', 5, 6),
+            (1, 'jueves', 3, 3),
+        ])
+        for bloque in (1, 2, 5, 6):
+            self.assertTrue(bitmap.disponible(1, 'lunes', bloque))
+        for bloque in (3, 4):
+            self.assertFalse(bitmap.disponible(1, 'lunes', bloque))
+        self.assertTrue(bitmap.disponible(1, 'jueves', 3))
+
+    def test_profesor_o_dia_desconocido(self):
+        """Un profesor sin filas o un día sin filas nunca está disponible"""
+        bitmap = BitmapDisponibilidad([(1, 'lunes', 1, 6)])
+        self.assertFalse(bitmap.disponible(99, 'lunes', 1))
+        self.assertFalse(bitmap.disponible(1, 'viernes', 1))
+        self.assertFalse(BitmapDisponibilidad([]).disponible(1, 'lunes', 1))
@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from enum import Enum
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.test import SimpleTestCase
+
+from horarios.management.commands import generar_horarios
+from horarios.management.commands.generar_horarios import Command, MSGSPEC_AVAILABLE
+
+
+class Severidad(Enum):
+    ALTA = 'alta'
+
+
+class Nodo:
+    def __init__(self):
+        self.nombre = 'Química'
+        self.bloques = (1, 2)
+
+
+@dataclass
+class ResumenPrueba:
+    curso: str
+    profesores: set
+    generado: datetime
+    fecha: date
+    severidad: Severidad
+    fitness: float
+    extras: dict = field(default_factory=dict)
+
+
+def _rechazar_constante(nombre):
+    raise ValueError(f"constante JSON inválida: {nombre}")
+
+
+@skipUnless(MSGSPEC_AVAILABLE, 'msgspec no está instalado')
+class GuardarReporteJsonTest(SimpleTestCase):
+    def _guardar(self, reporte, con_msgspec):
+        with tempfile.TemporaryDirectory() as directorio:
+            archivo = os.path.join(directorio, 'reporte.json')
+            comando = Command(stdout=StringIO())
+            with mock.patch.object(generar_horarios, 'MSGSPEC_AVAILABLE', con_msgspec):
+                comando._guardar_reporte_json(reporte, archivo)
+            with open(archivo, encoding='utf-8') as f:
+                return json.loads(f.read(), parse_constant=_rechazar_constante)
+
+    def test_msgspec_y_json_escriben_el_mismo_reporte(self):
+        """Ambos encoders producen el mismo JSON válido para los tipos del reporte"""
+        reporte = {
+            'resumen': [
+                ResumenPrueba(
+                    curso='6A',
+                    profesores={3, 1, 2},
+                    generado=datetime(2026, 10, 17, 4, 5, 6, 120, tzinfo=timezone.utc),
+                    fecha=date(2026, 10, 17),
+                    severidad=Severidad.ALTA,
+                    fitness=float('nan'),
+                    extras={'nodo': Nodo(), 'limite': float('inf'), 'dias': frozenset({'lunes'})},
+                )
+            ],
+            'local': datetime(2026, 10, 17, 4, 5, 6),
+            'pares': [(1, 'lunes'), (2, 'martes')],
+        }
+
+        con_msgspec = self._guardar(reporte, True)
+        con_json = self._guardar(reporte, False)
+
+        self.assertEqual(con_json, con_msgspec)
+        resumen = con_json['resumen'][0]
+        self.assertEqual(sorted(resumen['profesores']), [1, 2, 3])
+        self.assertEqual(resumen['generado'], '2026-10-17T04:05:06.000120Z')
+        self.assertIsNone(resumen['fitness'])
+        self.assertIsNone(resumen['extras']['limite'])
+        self.assertEqual(resumen['extras']['nodo'], {'nombre': 'Química', 'bloques': [1, 2]})
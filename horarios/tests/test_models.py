@@ -1,11 +1,13 @@
 from django.test import TestCase
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from horarios.models import (
     Profesor, Materia, Curso, Grado, Aula, BloqueHorario, 
-    Horario, MateriaProfesor, MateriaGrado, DisponibilidadProfesor
+    Horario, MateriaProfesor, MateriaGrado, DisponibilidadProfesor, TrackerCorrida
 )
 from datetime import time
+import hashlib
+import json
 
 
 class ProfesorModelTest(TestCase):
@@ -74,6 +76,10 @@ class GradoModelTest(TestCase):
             g = Grado(nombre='PRIMERO')
             g.full_clean()
 
+        # 3. Duplicado sin distinguir mayúsculas (restricción en la BD)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Grado.objects.create(nombre='primero')
+
 
 class AulaModelTest(TestCase):
     def setUp(self):
@@ -139,3 +145,97 @@ class DisponibilidadProfesorModelTest(TestCase):
                 bloque_fin=2
             )
             d.full_clean()
+
+
+class HorarioAulaTest(TestCase):
+    def setUp(self):
+        self.salon = Aula.objects.create(nombre='SALON 6A', tipo='comun')
+        self.otro_salon = Aula.objects.create(nombre='SALON 6B', tipo='comun')
+        grado = Grado.objects.create(nombre='SEXTO')
+        self.curso = Curso.objects.create(nombre='6A', grado=grado, aula_fija=self.salon)
+        self.materia = Materia.objects.create(nombre='Química', bloques_por_semana=2, requiere_aula_especial=True)
+        self.profesor = Profesor.objects.create(nombre='Ana Gómez')
+        DisponibilidadProfesor.objects.create(profesor=self.profesor, dia='lunes', bloque_inicio=1, bloque_fin=6)
+
+    def _horario(self, aula):
+        return Horario(curso=self.curso, materia=self.materia, profesor=self.profesor, aula=aula, dia='lunes', bloque=1)
+
+    def test_aula_fija_del_curso_es_valida(self):
+        """Una materia con aula especial puede dictarse en el aula fija del curso"""
+        self._horario(self.salon).clean()
+
+    def test_aula_comun_ajena_requiere_aula_especial(self):
+        """Fuera del aula fija, una materia con aula especial no va en un aula común"""
+        with self.assertRaises(ValidationError):
+            self._horario(self.otro_salon).clean()
+
+
+class TrackerCorridaHashTest(TestCase):
+    def _hash_original(self):
+        """Fórmula previa al streaming: los hashes guardados en TrackerCorrida dependen de ella"""
+        estado = {
+            'cursos': list(Curso.objects.values('id', 'nombre', 'grado_id', 'aula_fija_id').order_by('id')),
+            'profesores': list(Profesor.objects.values('id', 'nombre').order_by('id')),
+            'materias': list(Materia.objects.values('id', 'nombre', 'bloques_por_semana').order_by('id')),
+            'materia_grado': list(MateriaGrado.objects.values('materia_id', 'grado_id').order_by('materia_id')),
+            'materia_profesor': list(MateriaProfesor.objects.values('materia_id', 'profesor_id').order_by('materia_id')),
+            'disponibilidad': list(DisponibilidadProfesor.objects.values('profesor_id', 'dia', 'bloque_inicio', 'bloque_fin').order_by('profesor_id')),
+            'bloques': list(BloqueHorario.objects.values('numero', 'tipo').order_by('numero')),
+        }
+        return hashlib.sha256(json.dumps(estado, sort_keys=True).encode()).hexdigest()
+
+    def test_hash_vacio_igual_a_formula_original(self):
+        """Con tablas vacías el hash coincide con json.dumps(sort_keys=True)"""
+        self.assertEqual(TrackerCorrida().calcular_hash_sistema(), self._hash_original())
+
+    def test_hash_con_datos_igual_a_formula_original(self):
+        """Con datos (tildes, FK nulas, varias filas) el hash coincide con json.dumps(sort_keys=True)"""
+        grado = Grado.objects.create(nombre='PRIMERO')
+        aula = Aula.objects.create(nombre='AULA-101', tipo='comun', capacidad=40)
+        Curso.objects.create(nombre='PRIMERO A', grado=grado, aula_fija=aula)
+        Curso.objects.create(nombre='PRIMERO B', grado=grado)
+        ana = Profesor.objects.create(nombre='Ana Muñoz')
+        jose = Profesor.objects.create(nombre='José Pérez')
+        matematicas = Materia.objects.create(nombre='Matemáticas', bloques_por_semana=5)
+        educacion = Materia.objects.create(nombre='Educación Física', bloques_por_semana=2)
+        MateriaGrado.objects.create(grado=grado, materia=matematicas)
+        MateriaGrado.objects.create(grado=grado, materia=educacion)
+        MateriaProfesor.objects.create(profesor=ana, materia=matematicas)
+        MateriaProfesor.objects.create(profesor=jose, materia=educacion)
+        DisponibilidadProfesor.objects.create(profesor=ana, dia='miércoles', bloque_inicio=1, bloque_fin=6)
+        DisponibilidadProfesor.objects.create(profesor=jose, dia='lunes', bloque_inicio=2, bloque_fin=4)
+        BloqueHorario.objects.create(numero=1, hora_inicio=time(8, 0), hora_fin=time(8, 45), tipo='clase')
+        BloqueHorario.objects.create(numero=2, hora_inicio=time(8, 45), hora_fin=time(9, 0), tipo='descanso')
+
+        self.assertEqual(TrackerCorrida().calcular_hash_sistema(), self._hash_original())
+
+
+class CrearEnLoteTest(TestCase):
+    def setUp(self):
+        self.grado = Grado.objects.create(nombre='PRIMERO')
+        self.profesor = Profesor.objects.create(nombre='Ana Muñoz')
+        self.matematicas = Materia.objects.create(nombre='Matemáticas', bloques_por_semana=5)
+        self.lengua = Materia.objects.create(nombre='Lengua', bloques_por_semana=4)
+
+    def test_materia_profesor_descarta_duplicados(self):
+        """Pares repetidos o ya existentes se descartan sin error"""
+        MateriaProfesor.objects.create(profesor=self.profesor, materia=self.matematicas)
+        MateriaProfesor.crear_en_lote([
+            (self.profesor.id, self.matematicas.id),
+            (self.profesor.id, self.lengua.id),
+            (self.profesor.id, self.lengua.id),
+        ])
+        self.assertEqual(
+            set(MateriaProfesor.objects.values_list('profesor_id', 'materia_id')),
+            {(self.profesor.id, self.matematicas.id), (self.profesor.id, self.lengua.id)}
+        )
+
+    def test_materia_grado_descarta_duplicados(self):
+        """Pares repetidos o ya existentes se descartan sin error"""
+        MateriaGrado.objects.create(grado=self.grado, materia=self.lengua)
+        MateriaGrado.crear_en_lote({(self.grado.id, self.matematicas.id), (self.grado.id, self.lengua.id)})
+        MateriaGrado.crear_en_lote([])
+        self.assertEqual(
+            set(MateriaGrado.objects.values_list('grado_id', 'materia_id')),
+            {(self.grado.id, self.matematicas.id), (self.grado.id, self.lengua.id)}
+        )
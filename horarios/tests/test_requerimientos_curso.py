@@ -0,0 +1,42 @@
+from django.test import TestCase
+
+from horarios.application.services.requerimientos_curso import poblar_curso_materia_requerida
+from horarios.models import Curso, CursoMateriaRequerida, Grado, Materia
+
+
+class PoblarCursoMateriaRequeridaTest(TestCase):
+    def setUp(self):
+        self.primero = Grado.objects.create(nombre='PRIMERO')
+        self.segundo = Grado.objects.create(nombre='SEGUNDO')
+        self.curso_a = Curso.objects.create(nombre='PRIMERO A', grado=self.primero)
+        self.curso_b = Curso.objects.create(nombre='PRIMERO B', grado=self.primero)
+        self.curso_sin_plan = Curso.objects.create(nombre='SEGUNDO A', grado=self.segundo)
+        self.matematicas = Materia.objects.create(nombre='Matemáticas', bloques_por_semana=5)
+        self.lengua = Materia.objects.create(nombre='Lengua', bloques_por_semana=4)
+
+    def test_crea_plan_del_grado_por_curso(self):
+        """Cada curso recibe las materias de su grado con sus bloques por semana"""
+        creados = poblar_curso_materia_requerida(
+            Curso.objects.all(), {self.primero.id: [self.matematicas, self.lengua]}
+        )
+
+        self.assertEqual(creados, 4)
+        self.assertEqual(
+            set(CursoMateriaRequerida.objects.values_list('curso_id', 'materia_id', 'bloques_requeridos')),
+            {
+                (self.curso_a.id, self.matematicas.id, 5), (self.curso_a.id, self.lengua.id, 4),
+                (self.curso_b.id, self.matematicas.id, 5), (self.curso_b.id, self.lengua.id, 4),
+            }
+        )
+        self.assertFalse(CursoMateriaRequerida.objects.filter(curso=self.curso_sin_plan).exists())
+
+    def test_reemplaza_requerimientos_previos(self):
+        """Los requerimientos existentes se reconstruyen, no se acumulan"""
+        CursoMateriaRequerida.objects.create(curso=self.curso_sin_plan, materia=self.lengua, bloques_requeridos=9)
+
+        poblar_curso_materia_requerida([self.curso_a], {self.primero.id: [self.matematicas]})
+
+        self.assertEqual(
+            list(CursoMateriaRequerida.objects.values_list('curso_id', 'materia_id', 'bloques_requeridos')),
+            [(self.curso_a.id, self.matematicas.id, 5)]
+        )